@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 import argparse
+import io
 import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from .distribution import *
 from .git import *
@@ -13,83 +16,134 @@ from .submodules import *
 from .utils import *
 
 
+def _fetch_one(
+    name,
+    path,
+    get_tag_override,
+    get_chart_path_override,
+    cat_files,
+    chart_cache,
+    cache,
+    refetch_interval,
+):
+    """Collect the update info for a single submodule."""
+    tags, current_tag, latest_tag, head = cached(
+        cache, (path, "tags", None), fetch_tags, path, 50, refetch_interval
+    )
+
+    suggested_tag = get_tag_override(name, latest_tag)
+
+    chart_rel_path = get_chart_path_override(name, default_chart_location)
+    sub_chart = os.path.join(path, chart_rel_path)
+    current_version, current_chart_name = cached(
+        cache, (path, "chart", chart_rel_path), chart_cache.get, sub_chart, head
+    )
+
+    # "simulate" suggested version by reading the chart at suggested_tag
+    suggested_version = None
+    chart_name = None
+    if suggested_tag and suggested_tag != "none":
+        if suggested_tag == current_tag:
+            # the chart at the checked out tag is the one already read
+            suggested_version = current_version
+            chart_name = current_chart_name
+        else:
+            # git cat-file allows reading a file at a tag without checkout
+            ref = f"{suggested_tag}:{chart_rel_path}"
+            try:
+                content = cached(
+                    cache, (path, "show", ref), cat_files.get(path).read, ref
+                )
+            except subprocess.CalledProcessError:
+                # the batch process died, fall back to a one-off git show
+                content = run(
+                    ["git", "show", ref], cwd=path, capture_output=True, binary=True
+                )
+            chart = load_yaml_bytes(content) if content else {}
+            suggested_version = chart.get("version")
+            chart_name = chart.get("name")
+
+    return {
+        "path": path,
+        "chart_name": chart_name,
+        "current_tag": current_tag,
+        "latest_tag": latest_tag,
+        "suggested_tag": suggested_tag,
+        "recent_tags": tags,
+        "current_tag_chart_version": current_version,
+        "suggested_tag_chart_version": suggested_version,
+        "chart_bump": _chart_bump(current_version, suggested_version),
+    }
+
+
+def _chart_bump(current_version, suggested_version):
+    if not suggested_version:
+        return None
+    if not current_version:
+        return "major"
+    return version_bump(current_version, suggested_version)
+
+
 def fetch_updates(
     submodule_tag_overrides,
     chart_path_overrides,
     prerelease_identifier=None,
     exclude_submodules=[],
+    cache=None,
+    cat_files=None,
+    refetch_interval=default_refetch_interval,
 ):
-    submodules = get_submodules()
+    if cache is None:
+        cache = {}
+    own_cat_files = cat_files is None
+    if own_cat_files:
+        cat_files = CatFilePool()
+    chart_cache = ChartVersionCache()
+    submodules = {
+        name: path
+        for name, path in get_submodules().items()
+        if path not in exclude_submodules
+    }
     updates = {}
-    global_bump_level = 0
 
-    submodule_chart_path_overrides = chart_path_overrides.get("submodule_charts", {})
-    for name, path in submodules.items():
-        if path in exclude_submodules:
-            continue
-        tags, current_tag, latest_tag = fetch_tags(path)
+    # bind the override lookups once instead of per submodule
+    get_tag_override = submodule_tag_overrides.get
+    get_chart_path_override = chart_path_overrides.get("submodule_charts", {}).get
+    try:
+        # submodules are independent and mostly wait on git, so fetch them concurrently
+        workers = max(1, min(max_fetch_workers, len(submodules)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = ex.map(
+                lambda item: _fetch_one(
+                    *item,
+                    get_tag_override,
+                    get_chart_path_override,
+                    cat_files,
+                    chart_cache,
+                    cache,
+                    refetch_interval,
+                ),
+                submodules.items(),
+            )
+            for name, info in zip(submodules, results):
+                updates[name] = info
+    finally:
+        if own_cat_files:
+            cat_files.close()
+    chart_cache.save()
 
-        suggested_tag = submodule_tag_overrides.get(name, latest_tag)
+    return updates, get_parent_info(
+        updates, chart_path_overrides, prerelease_identifier
+    )
 
-        chart_rel_path = submodule_chart_path_overrides.get(
-            name, default_chart_location
-        )
-        sub_chart = os.path.join(path, chart_rel_path)
-        current_version = get_chart_version(sub_chart)
-
-        # "simulate" suggested version by checking out suggested_tag in a temp way
-        suggested_version = None
-        chart_name = None
-        if suggested_tag and suggested_tag != "none":
-            # git show allows reading a file at a tag without checkout
-            try:
-                content = run(
-                    " ".join(
-                        [
-                            "git",
-                            "show",
-                            f"{suggested_tag}:{chart_rel_path}",
-                        ]
-                    ),
-                    cwd=path,
-                    capture_output=True,
-                )
-                chart = load_yaml_string(content)
-                suggested_version = chart.get("version")
-                chart_name = chart.get("name")
-            except subprocess.CalledProcessError:
-                print(
-                    f"Error: cannot read {chart_rel_path} at tag {suggested_tag} in submodule {name} ({path})",
-                    file=sys.stderr,
-                )
-                sys.exit(1)
 
-        bump = None
-        if suggested_version:
-            if not current_version:
-                bump = "major"
-            else:
-                bump = version_bump(current_version, suggested_version)
-            if bump:
-                global_bump_level = max(global_bump_level, bump_priority[bump])
-
-        updates[name] = {
-            "path": path,
-            "chart_name": chart_name,
-            "current_tag": current_tag,
-            "latest_tag": latest_tag,
-            "suggested_tag": suggested_tag,
-            "recent_tags": tags,
-            "current_tag_chart_version": current_version,
-            "suggested_tag_chart_version": suggested_version,
-            "chart_bump": bump,
-        }
-
-    bump_type = None
-    for k, v in bump_priority.items():
-        if v == global_bump_level:
-            bump_type = k
-            break
+def get_parent_info(updates, chart_path_overrides, prerelease_identifier=None):
+    """Compute the parent chart version suggestion from the submodule updates."""
+    bump_type = max(
+        (info["chart_bump"] for info in updates.values() if info["chart_bump"]),
+        key=bump_priority.get,
+        default=bump_by_priority[0],
+    )
 
     repo_chart = chart_path_overrides.get("repo_chart", default_chart_location)
     (repo_current, repo_base) = get_chart_version(repo_chart, True)
@@ -106,90 +160,150 @@ def fetch_updates(
 
     if prerelease_identifier is not None:
         prerelease = parse_version(repo_current, VersionGroup.PRERELEASE)
-        if parse_version(repo_suggested) > parse_version(repo_current):
+        current_parts = parse_version(repo_current)
+        suggested_parts = parse_version(repo_suggested)
+        if suggested_parts > current_parts:
             repo_suggested = f"{repo_suggested}-{prerelease_identifier}"
         elif prerelease and prerelease_identifier in prerelease:
             prerelease_number = 0
             parts = prerelease.split(".")
             if len(parts) > 1 and parts[-1].isdigit():
                 prerelease_number = int(parts[-1])
-            repo_suggested = f"{".".join(str(x) for x in parse_version(repo_current))}-{prerelease_identifier}.{prerelease_number+1}"
+            current_base = ".".join(str(x) for x in current_parts)
+            repo_suggested = (
+                f"{current_base}-{prerelease_identifier}.{prerelease_number+1}"
+            )
         else:
             repo_suggested = f"{repo_suggested}-{prerelease_identifier}"
 
-    return updates, {
+    return {
         "current": repo_current,
         "suggested": repo_suggested,
         "chart_bump": repo_bump,
     }
 
 
+def apply_submodule_delta(updates, delta):
+    """Return a copy of updates reflecting the tags checked out by apply_submodule_updates."""
+    new_updates = {}
+    for name, info in updates.items():
+        info = {**info, **delta.get(name, {})}
+        info["chart_bump"] = _chart_bump(
+            info["current_tag_chart_version"], info["suggested_tag_chart_version"]
+        )
+        new_updates[name] = info
+    return new_updates
+
+
+def invalidate_cache(cache, paths):
+    """Drop cached working tree state of the given submodule paths."""
+    for key in [k for k in cache if k[0] in paths and k[1] != "show"]:
+        del cache[key]
+
+
+_comment_row = (
+    "| {name} | {current_tag} | {suggested_tag} | {current_chart} | "
+    "{suggested_chart} | {chart_bump} | {recent_tags} |\n"
+).format
+
+
 def print_updates(updates, parent_info, output="cli", changes=None):
     """
     output: "cli", "json", "ci", None
     """
-    if output == None:
+    if output is None:
         return
 
     if output == "json":
         data = {"parent": parent_info, "submodules": updates}
         if changes is not None:
             data["committed_changes"] = changes
-        print(json.dumps(data, indent=2))
+        dump_json(data, sys.stdout)
+        sys.stdout.write("\n")
         return
 
+    if updates is None:
+        # the table renderers need submodules, e.g. a `format` input without them
+        print("No submodule updates to render", file=sys.stderr)
+        return
+
+    buf = io.StringIO()
     if output == "comment":
-        lines = []
-        lines.append(f"### Submodule updates")
-        lines.append(
-            "| Submodule | Current Tag | Suggested Tag | Current Chart | Suggested Chart | Chart Bump | Recent Tags |"
+        buf.write("### Submodule updates\n")
+        buf.write(
+            "| Submodule | Current Tag | Suggested Tag | Current Chart | Suggested Chart | Chart Bump | Recent Tags |\n"
         )
-        lines.append(
-            "|-----------|------------|---------------|---------------|----------------|------|-------------|"
+        buf.write(
+            "|-----------|------------|---------------|---------------|----------------|------|-------------|\n"
         )
         for name, info in updates.items():
-            recent = ", ".join(info["recent_tags"][:5])
-            lines.append(
-                f"| {name} | {info['current_tag']} | {safe(info['suggested_tag'])} | "
-                f"{info['current_tag_chart_version']} | {safe(info['suggested_tag_chart_version'])} | "
-                f"{info['chart_bump'] or '-'} | {recent} |"
+            buf.write(
+                _comment_row(
+                    name=name,
+                    current_tag=info["current_tag"],
+                    suggested_tag=safe(info["suggested_tag"]),
+                    current_chart=info["current_tag_chart_version"],
+                    suggested_chart=safe(info["suggested_tag_chart_version"]),
+                    chart_bump=info["chart_bump"] or "-",
+                    recent_tags=", ".join(info["recent_tags"][:5]),
+                )
             )
-        lines.append("")
-        lines.append(
-            f"**Parent chart:** {parent_info['current']} → {parent_info['suggested']} (chart bump: {parent_info['chart_bump'] or '-'})"
+        buf.write("\n")
+        buf.write(
+            f"**Parent chart:** {parent_info['current']} → {parent_info['suggested']} (chart bump: {parent_info['chart_bump'] or '-'})\n"
         )
         if changes is not None:
             if changes is True:
-                lines.append(f"**Committed changes to this branch**")
+                buf.write("**Committed changes to this branch**\n")
             else:
-                lines.append(f"**No changes in this branch**")
-        print("\n".join(lines))
+                buf.write("**No changes in this branch**\n")
+        sys.stdout.write(buf.getvalue())
         return
 
     # CLI output
-    print("Submodule updates (<git-tag> (<chart-version>)):")
+    buf.write("Submodule updates (<git-tag> (<chart-version>)):\n")
     for name, info in updates.items():
-        print(f"- {name}:")
-        print(
-            f"    Current tag: {info['current_tag']} ({info['current_tag_chart_version']})"
-        )
-        print(
-            f"    Suggested tag: {safe(info['suggested_tag'])} ({safe(info['suggested_tag_chart_version'])})"
+        buf.write(
+            f"- {name}:\n"
+            f"    Current tag: {info['current_tag']} ({info['current_tag_chart_version']})\n"
+            f"    Suggested tag: {safe(info['suggested_tag'])} ({safe(info['suggested_tag_chart_version'])})\n"
+            f"    Chart bump: {info['chart_bump'] or '-'}\n"
+            f"    Recent tags: {', '.join(info['recent_tags'][:5])}\n"
         )
-        print(f"    Chart bump: {info['chart_bump'] or '-'}")
-        print(f"    Recent tags: {', '.join(info['recent_tags'][:5])}")
-    print(
-        f"Parent chart: {parent_info['current']} → {parent_info['suggested']} (chart bump: {parent_info['chart_bump'] or '-'})"
+    buf.write(
+        f"Parent chart: {parent_info['current']} → {parent_info['suggested']} (chart bump: {parent_info['chart_bump'] or '-'})\n"
     )
-    if changes is None:
-        return
     if changes is True:
-        print("Committed changes to this branch")
-    else:
-        print("No changes in this branch")
+        buf.write("Committed changes to this branch\n")
+    elif changes is not None:
+        buf.write("No changes in this branch\n")
+    sys.stdout.write(buf.getvalue())
 
 
-def main():
+_commands = ("fetch", "update", "format", "submodule", "distribution", "bump")
+_global_value_options = ("--submodule-tag-overrides", "--submodule-tag-overrides-file")
+
+
+def _peek_command(argv):
+    """Return the subcommand in argv, skipping global options and their values."""
+    args = iter(argv)
+    for arg in args:
+        if arg.startswith("--") and "=" not in arg:
+            # argparse accepts unambiguous prefixes of long options
+            if any(option.startswith(arg) for option in _global_value_options):
+                next(args, None)
+        elif not arg.startswith("-"):
+            return arg if arg in _commands else None
+    return None
+
+
+@lru_cache(maxsize=None)
+def build_parser(command=None):
+    """
+    Build the argument parser. When command is given, only its subparser is added.
+    Returns the parser and the parsers used to print help for nested commands.
+    Parsers are cached per command, so repeated in-process calls reuse them.
+    """
     chart_args = argparse.ArgumentParser(add_help=False)
     chart_args.add_argument(
         "--repo-chart-path",
@@ -225,6 +339,13 @@ def main():
         default=False,
     )
 
+    chart_args.add_argument(
+        "--refetch-interval",
+        type=int,
+        help="Skip fetching a submodule's tags if relsync fetched them less than this many seconds ago (0 always fetches). Ignored with --force-refetch",
+        default=default_refetch_interval,
+    )
+
     chart_args.add_argument(
         "--no-backup",
         action="store_true",
@@ -257,106 +378,139 @@ def main():
         help='JSON file in the format \'{"subA": "latest", "subB": "v2"}\' with tags to be used as overrides for the suggested tags.',
         default="submodule-tag-overrides.json",
     )
+    if command is not None:
+        # report errors with the full parser so the usage lists every command
+        parser.error = lambda message: build_parser(None)[0].error(message)
 
     subparsers = parser.add_subparsers(dest="command")
-    fetch_parser = subparsers.add_parser(
-        "fetch",
-        help="Get submodule updates and corresponding chart changes",
-        parents=[chart_args, output_args],
-    )
-    update_parser = subparsers.add_parser(
-        "update",
-        help="Update submodules and chart versions and commit",
-        parents=[chart_args, output_args, commit_args],
-    )
-    update_parser.add_argument(
-        "--prerelease-identifier",
-        help="Add a prerelease identifier to the helm chart version. Follows the format <next-version>-<identifier>(.nr-of-the-update)",
-        default=None,
-    )
-    update_parser.add_argument(
-        "--exclude-submodule",
-        help="Do not look for updates in a submodule with the given path",
-        action="append",
-        default=[],
-    )
+    help_parsers = {}
+    if command in (None, "fetch"):
+        fetch_parser = subparsers.add_parser(
+            "fetch",
+            help="Get submodule updates and corresponding chart changes",
+            parents=[chart_args, output_args],
+        )
 
-    format_parser = subparsers.add_parser(
-        "format",
-        help="Render JSON file or string in the desired format",
-        parents=[output_args],
-    )
-    format_parser.add_argument(
-        "-f",
-        "--file",
-        help="Use file contents instead of STDIN",
-    )
+    if command in (None, "update"):
+        update_parser = subparsers.add_parser(
+            "update",
+            help="Update submodules and chart versions and commit",
+            parents=[chart_args, output_args, commit_args],
+        )
+        update_parser.add_argument(
+            "--prerelease-identifier",
+            help="Add a prerelease identifier to the helm chart version. Follows the format <next-version>-<identifier>(.nr-of-the-update)",
+            default=None,
+        )
+        update_parser.add_argument(
+            "--refresh-state",
+            action="store_true",
+            help="Re-fetch submodule updates for the state file after updating instead of deriving them from the applied changes",
+            default=False,
+        )
+        update_parser.add_argument(
+            "--exclude-submodule",
+            help="Do not look for updates in a submodule with the given path",
+            action="append",
+            default=[],
+        )
 
-    parser_submodule = subparsers.add_parser(
-        "submodule",
-        help="Update submodules and commit",
-    )
-    parser_submodule_subparsers = parser_submodule.add_subparsers(
-        dest="submodule_command"
-    )
-    submodule_update_parser = parser_submodule_subparsers.add_parser(
-        "update", parents=[commit_args], help="Update submodules and commit"
-    )
-    submodule_update_parser.add_argument(
-        "-a",
-        "--accept",
-        action="store_true",
-        help="Accept all suggested tags. Either the tag defined in the mappings or the latest tag.",
-    )
+    if command in (None, "format"):
+        format_parser = subparsers.add_parser(
+            "format",
+            help="Render JSON file or string in the desired format",
+            parents=[output_args],
+        )
+        format_parser.add_argument(
+            "-f",
+            "--file",
+            help="Use file contents instead of STDIN",
+        )
 
-    parser_distribution = subparsers.add_parser(
-        "distribution",
-        help="Update chart versions and commit",
-    )
-    parser_distribution_subparsers = parser_distribution.add_subparsers(
-        dest="distribution_command",
-    )
-    distribution_update_parser = parser_distribution_subparsers.add_parser(
-        "update", help="Update distribution versions", parents=[chart_args, commit_args]
-    )
+    if command in (None, "submodule"):
+        parser_submodule = subparsers.add_parser(
+            "submodule",
+            help="Update submodules and commit",
+        )
+        parser_submodule_subparsers = parser_submodule.add_subparsers(
+            dest="submodule_command"
+        )
+        submodule_update_parser = parser_submodule_subparsers.add_parser(
+            "update", parents=[commit_args], help="Update submodules and commit"
+        )
+        submodule_update_parser.add_argument(
+            "-a",
+            "--accept",
+            action="store_true",
+            help="Accept all suggested tags. Either the tag defined in the mappings or the latest tag.",
+        )
+        submodule_update_parser.add_argument(
+            "--refetch-interval",
+            type=int,
+            help="Skip fetching a submodule's tags if relsync fetched them less than this many seconds ago (0 always fetches)",
+            default=default_refetch_interval,
+        )
+        help_parsers["submodule"] = parser_submodule
 
-    tag_parser = subparsers.add_parser(
-        "bump",
-        help="Bump the version of repository",
-        parents=[chart_args, commit_args, output_args],
-    )
-    tag_parser.add_argument(
-        "bump_type",
-        help="The bump to apply to the repo",
-        choices=["major", "minor", "patch", "release"],
-        default="patch",
-    )
-    tag_parser.add_argument("-t", "--create-tag", action="store_true")
-    tag_parser.add_argument(
-        "--skip-repo-bump",
-        help="Skip bumping the repo version for chart only changes",
-        action="store_true",
-        default=False,
-    )
-    tag_parser.add_argument(
-        "--chart-bump-type",
-        help="The bump type to apply to the chart",
-        choices=["major", "minor", "patch", "release"],
-        default="patch",
-    )
-    tag_parser.add_argument(
-        "--no-chart",
-        action="store_true",
-        help="Use if this repo does not contain a chart",
-        default=False,
-    )
+    if command in (None, "distribution"):
+        parser_distribution = subparsers.add_parser(
+            "distribution",
+            help="Update chart versions and commit",
+        )
+        parser_distribution_subparsers = parser_distribution.add_subparsers(
+            dest="distribution_command",
+        )
+        distribution_update_parser = parser_distribution_subparsers.add_parser(
+            "update",
+            help="Update distribution versions",
+            parents=[chart_args, commit_args],
+        )
+        help_parsers["distribution"] = distribution_update_parser
+
+    if command in (None, "bump"):
+        tag_parser = subparsers.add_parser(
+            "bump",
+            help="Bump the version of repository",
+            parents=[chart_args, commit_args, output_args],
+        )
+        tag_parser.add_argument(
+            "bump_type",
+            help="The bump to apply to the repo",
+            choices=["major", "minor", "patch", "release"],
+            default="patch",
+        )
+        tag_parser.add_argument("-t", "--create-tag", action="store_true")
+        tag_parser.add_argument(
+            "--skip-repo-bump",
+            help="Skip bumping the repo version for chart only changes",
+            action="store_true",
+            default=False,
+        )
+        tag_parser.add_argument(
+            "--chart-bump-type",
+            help="The bump type to apply to the chart",
+            choices=["major", "minor", "patch", "release"],
+            default="patch",
+        )
+        tag_parser.add_argument(
+            "--no-chart",
+            action="store_true",
+            help="Use if this repo does not contain a chart",
+            default=False,
+        )
+
+    return parser, help_parsers
 
+
+def main():
+    parser, help_parsers = build_parser(_peek_command(sys.argv[1:]))
     args = parser.parse_args()
 
     submodule_tag_overrides = parse_tag_overrides(
         args.submodule_tag_overrides_file, args.submodule_tag_overrides
     )
     chart_path_overrides = {}
+    refetch_interval = default_refetch_interval
     match (args.command):
         case "fetch" | "update" | "distribution" | "bump":
             chart_path_overrides.update(
@@ -366,6 +520,7 @@ def main():
                     args.repo_chart_path,
                 )
             )
+            refetch_interval = 0 if args.force_refetch else args.refetch_interval
         case _:
             pass
 
@@ -382,7 +537,7 @@ def main():
                 sys.exit(1)
 
             try:
-                data = json.loads(raw)
+                data = load_json_string(raw)
             except json.JSONDecodeError as e:
                 print(f"Invalid JSON: {e}", file=sys.stderr)
                 sys.exit(1)
@@ -396,49 +551,70 @@ def main():
 
         case "fetch":
             updates, parent_info = fetch_updates(
-                submodule_tag_overrides, chart_path_overrides
+                submodule_tag_overrides,
+                chart_path_overrides,
+                refetch_interval=refetch_interval,
             )
             print_updates(updates, parent_info, args.output)
             if args.use_state_file:
                 save_state(updates, parent_info, args.state_file)
 
         case "update":
-            if (
-                args.use_state_file
-                and args.state_file
-                and not args.force_refetch
-                and os.path.isfile(args.state_file)
-            ):
-                updates, parent_info = load_state(args.state_file)
-                if updates is None or parent_info is None:
-                    print(f"State file {args.state_file} is invalid", file=sys.stderr)
-                    sys.exit(1)
-            else:
-                updates, parent_info = fetch_updates(
-                    submodule_tag_overrides,
+            cache = {}
+            with CatFilePool() as cat_files:
+                if (
+                    args.use_state_file
+                    and args.state_file
+                    and not args.force_refetch
+                    and os.path.isfile(args.state_file)
+                ):
+                    updates, parent_info = load_state(args.state_file)
+                    if updates is None or parent_info is None:
+                        print(
+                            f"State file {args.state_file} is invalid", file=sys.stderr
+                        )
+                        sys.exit(1)
+                else:
+                    updates, parent_info = fetch_updates(
+                        submodule_tag_overrides,
+                        chart_path_overrides,
+                        prerelease_identifier=args.prerelease_identifier,
+                        exclude_submodules=args.exclude_submodule,
+                        cache=cache,
+                        cat_files=cat_files,
+                        refetch_interval=refetch_interval,
+                    )
+                    if args.use_state_file:
+                        save_state(updates, parent_info, args.state_file)
+
+                submodule_delta = apply_submodule_updates(updates, True, True)
+                apply_distribution_updates(
+                    updates,
+                    parent_info,
                     chart_path_overrides,
+                    True,
+                    args.no_backup,
                     prerelease_identifier=args.prerelease_identifier,
-                    exclude_submodules=args.exclude_submodule,
                 )
                 if args.use_state_file:
-                    save_state(updates, parent_info, args.state_file)
-
-            apply_submodule_updates(updates, True, True)
-            apply_distribution_updates(
-                updates,
-                parent_info,
-                chart_path_overrides,
-                True,
-                args.no_backup,
-                prerelease_identifier=args.prerelease_identifier,
-            )
-            new_updates, new_parent_info = fetch_updates(
-                submodule_tag_overrides,
-                chart_path_overrides,
-                exclude_submodules=args.exclude_submodule,
-            )
-            if args.use_state_file:
-                save_state(new_updates, new_parent_info, args.state_file)
+                    if args.refresh_state:
+                        invalidate_cache(
+                            cache, [updates[name]["path"] for name in submodule_delta]
+                        )
+                        new_updates, new_parent_info = fetch_updates(
+                            submodule_tag_overrides,
+                            chart_path_overrides,
+                            exclude_submodules=args.exclude_submodule,
+                            cache=cache,
+                            cat_files=cat_files,
+                            refetch_interval=refetch_interval,
+                        )
+                    else:
+                        new_updates = apply_submodule_delta(updates, submodule_delta)
+                        new_parent_info = get_parent_info(
+                            new_updates, chart_path_overrides
+                        )
+                    save_state(new_updates, new_parent_info, args.state_file)
             changed = None
             if args.commit:
                 changed = commit_changes("Update submodules and chart versions")
@@ -448,14 +624,16 @@ def main():
             match (args.submodule_command):
                 case "update":
                     updates, parent_info = fetch_updates(
-                        submodule_tag_overrides, chart_path_overrides
+                        submodule_tag_overrides,
+                        chart_path_overrides,
+                        refetch_interval=args.refetch_interval,
                     )
                     apply_submodule_updates(updates, yes=args.accept)
                     if args.commit:
                         commit_changes("Update submodules")
                 case _:
                     print("Unknown or missing command")
-                    parser_submodule.print_help()
+                    help_parsers["submodule"].print_help()
 
         case "distribution":
             match (args.distribution_command):
@@ -470,7 +648,7 @@ def main():
                         commit_changes("Update parent chart versions")
                 case _:
                     print("Unknown or missing command")
-                    distribution_update_parser.print_help()
+                    help_parsers["distribution"].print_help()
         case "bump":
             latest_tag = get_latest_tag()
             app_version = get_version_string(latest_tag)
@@ -495,7 +673,7 @@ def main():
                         )
                         commit_changes(message)
                     if args.create_tag:
-                        run(f"git tag {new_tag}")
+                        run(["git", "tag", new_tag])
                 else:
                     new_tag = app_version
                     if args.commit:
@@ -506,7 +684,7 @@ def main():
                         )
                         commit_changes(message)
                     if args.create_tag:
-                        run(f"git tag {new_tag}")
+                        run(["git", "tag", new_tag])
             if args.no_chart:
                 new_tag = app_version
                 if args.commit:
@@ -516,7 +694,7 @@ def main():
                         else "Update app versions"
                     )
                 if args.create_tag:
-                    run(f"git tag {new_tag}")
+                    run(["git", "tag", new_tag])
 
             match (args.output):
                 case "json":
@@ -528,9 +706,11 @@ def main():
                     print(json.dumps(output))
 
                 case "cli" | "comment" | _:
-                    print(f"Repo version: {app_version}")
-                    print(f"Chart Version: {safe(chart_version)}")
-                    print(f"New tag: {safe(new_tag)}")
+                    sys.stdout.write(
+                        f"Repo version: {app_version}\n"
+                        f"Chart Version: {safe(chart_version)}\n"
+                        f"New tag: {safe(new_tag)}\n"
+                    )
 
         case _:
             print("Unknown or missing command")
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 from .utils import *
 from .semver import bump_priority
@@ -22,16 +23,19 @@ def apply_distribution_updates(
         sys.exit(1)
 
     if not no_backup:
-        subprocess.run(f"cp {repo_chart} {repo_chart}.bak", shell=True)
+        shutil.copy2(repo_chart, f"{repo_chart}.bak")
     chart_data = load_yaml(repo_chart)
 
+    # the same chart may be listed more than once under different aliases
+    deps_by_name = {}
+    for dep in chart_data.get("dependencies", []):
+        deps_by_name.setdefault(dep["name"], []).append(dep)
+
     for info in updates.values():
-        for dep in chart_data.get("dependencies", []):
-            if dep["name"] == info["chart_name"]:
-                dep["version"] = (
-                    info["suggested_tag_chart_version"]
-                    or info["current_tag_chart_version"]
-                )
+        for dep in deps_by_name.get(info["chart_name"], ()):
+            dep["version"] = (
+                info["suggested_tag_chart_version"] or info["current_tag_chart_version"]
+            )
 
     if not quiet:
         print(
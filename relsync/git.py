@@ -1,46 +1,260 @@
+import configparser
+import os
 import subprocess
+import time
+from functools import lru_cache
 
 from .utils import run
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+default_refetch_interval = 0
+# same bound ThreadPoolExecutor uses by default for I/O-bound work
+max_fetch_workers = min(32, (os.cpu_count() or 1) + 4)
+fetch_marker = "relsync-fetch-tags"
+
+
+class GitCatFile:
+    """Persistent `git cat-file --batch` process for reading objects of a repo."""
+
+    def __init__(self, cwd=None):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, ref):
+        """Return the contents of `ref` (e.g. `<tag>:<path>`) as bytes, or None if missing."""
+        try:
+            self.process.stdin.write(f"{ref}\n".encode())
+            self.process.stdin.flush()
+            header = self.process.stdout.readline()
+        except BrokenPipeError:
+            header = b""
+        if not header:
+            raise subprocess.CalledProcessError(self.process.wait(), self.process.args)
+        # "<ref> missing" / "<ref> ambiguous", where the ref may contain spaces
+        if header.endswith((b" missing\n", b" ambiguous\n")):
+            return None
+        _, kind, size = header.rsplit(b" ", 2)
+        content = self.process.stdout.read(int(size))
+        self.process.stdout.read(1)  # trailing newline
+        return content if kind == b"blob" else None
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.process.stdout.close()
+        self.process.wait()
+
+
+class Pygit2BlobReader:
+    """In-process GitCatFile replacement backed by libgit2, used when pygit2 is installed."""
+
+    def __init__(self, cwd=None):
+        self.repo = pygit2.Repository(cwd or ".")
+
+    def read(self, ref):
+        """Return the contents of `ref` (e.g. `<tag>:<path>`) as bytes, or None if missing."""
+        try:
+            return self.repo.revparse_single(ref).read_raw()
+        except (KeyError, ValueError):
+            return None
+
+    def close(self):
+        self.repo.free()
+
+
+class CatFilePool:
+    """Object readers keyed by repo path, shared across reads and closed together."""
+
+    def __init__(self):
+        self.cat_files = {}
+
+    def get(self, path):
+        if path not in self.cat_files:
+            reader = GitCatFile if pygit2 is None else Pygit2BlobReader
+            self.cat_files[path] = reader(cwd=path)
+        return self.cat_files[path]
+
+    def close(self):
+        for cat_file in self.cat_files.values():
+            cat_file.close()
+        self.cat_files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 
 def get_submodules():
     """Return dict of submodule names -> paths from .gitmodules."""
-    out = run("git config --file .gitmodules --get-regexp path", capture_output=True)
+    try:
+        mtime_ns = os.stat(".gitmodules").st_mtime_ns
+    except OSError:
+        return {}
+    # copy so callers cannot modify the cached dict
+    return dict(_read_gitmodules(os.path.abspath(".gitmodules"), mtime_ns))
+
+
+@lru_cache(maxsize=8)
+def _read_gitmodules(path, mtime_ns):
+    # .gitmodules is INI-like, so parse it directly instead of spawning git config
+    config = configparser.ConfigParser(
+        strict=False,
+        interpolation=None,
+        allow_no_value=True,
+        inline_comment_prefixes=("#", ";"),
+    )
+    try:
+        config.read(path)
+    except configparser.Error:
+        # syntax configparser does not understand, let git read it
+        return _read_gitmodules_with_git(path)
+    submodules = {}
+    for section in config.sections():
+        kind, _, name = section.partition(" ")
+        if kind.lower() != "submodule" or not config[section].get("path"):
+            continue
+        sub_path = config[section]["path"]
+        if "\n" in sub_path:
+            # git has no continuation lines, this is a deeper indented key
+            return _read_gitmodules_with_git(path)
+        submodules[name.strip('"')] = sub_path.strip('"')
+    return submodules
+
+
+def _read_gitmodules_with_git(path):
+    out = run(
+        ["git", "config", "--file", path, "--get-regexp", "path"], capture_output=True
+    )
     submodules = {}
     for line in out.splitlines():
         parts = line.split(None, 1)
         if len(parts) != 2:
             continue
-        key, path = parts
+        key, sub_path = parts
         if not key.startswith("submodule.") or not key.endswith(".path"):
             continue
         name = key[len("submodule.") : -len(".path")]
-        submodules[name] = path
+        submodules[name] = sub_path
     return submodules
 
 
-def fetch_tags(path):
-    run("git fetch --tags --quiet", cwd=path)
-    tags = run("git tag -l | sort -Vr", cwd=path, capture_output=True).splitlines()
-    current = run(
-        "git describe --tags --exact-match 2>/dev/null || echo 'none'",
+def get_git_dir(path):
+    """Return the git directory of the repo at path, following submodule gitfiles."""
+    dot_git = os.path.join(path, ".git")
+    if os.path.isfile(dot_git):
+        with open(dot_git) as f:
+            gitdir = f.read().strip().removeprefix("gitdir:").strip()
+        return os.path.join(path, gitdir)
+    return dot_git
+
+
+def fetched_recently(path, max_age):
+    """Whether relsync fetched the tags of the repo at path less than max_age seconds ago."""
+    if max_age <= 0:
+        return False
+    # FETCH_HEAD is also touched by fetches without tags, so rely on our own marker
+    try:
+        mtime = os.path.getmtime(os.path.join(get_git_dir(path), fetch_marker))
+    except OSError:
+        return False
+    return time.time() - mtime < max_age
+
+
+def mark_fetched(path):
+    try:
+        with open(os.path.join(get_git_dir(path), fetch_marker), "w"):
+            pass
+    except OSError:
+        pass
+
+
+def fetch_tags(path, limit=50, max_age=default_refetch_interval):
+    """Return the newest `limit` tags, the tag at HEAD, the latest tag and HEAD's sha.
+
+    With max_age, the remote is only fetched when relsync's last tag fetch is older
+    than max_age seconds.
+    """
+    if not fetched_recently(path, max_age):
+        run(["git", "fetch", "--tags", "--quiet"], cwd=path)
+        mark_fetched(path)
+    refs = run(
+        [
+            "git",
+            "for-each-ref",
+            "--sort=-v:refname",
+            "--format=%(refname:short)%09%(*objectname)%09%(objectname)",
+            "refs/tags",
+        ],
         cwd=path,
         capture_output=True,
-    )
+    ).splitlines()
+    head = run(["git", "rev-parse", "HEAD"], cwd=path, capture_output=True)
+    tags = []
+    current = "none"
+    for ref in refs:
+        name, peeled, sha = ref.split("\t")
+        if len(tags) < limit:
+            tags.append(name)
+        elif current != "none":
+            break
+        # annotated tags point at a tag object, compare the commit it peels to
+        if current == "none" and (peeled or sha) == head:
+            current = name
     latest = tags[0] if tags else "none"
-    return tags, current, latest
+    return tags, current, latest, head
+
+
+def get_current_tag(path=None):
+    """Return the tag pointing exactly at HEAD, or 'none'."""
+    # same pick as fetch_tags when several tags point at HEAD: the highest version
+    tag = run(
+        [
+            "git",
+            "for-each-ref",
+            "--points-at=HEAD",
+            "--sort=-v:refname",
+            "--count=1",
+            "--format=%(refname:short)",
+            "refs/tags",
+        ],
+        cwd=path,
+        capture_output=True,
+    )
+    return tag or "none"
 
 
 def get_latest_tag():
-    tag = run("git tag -l | sort -Vr | head -n 1 || echo ''", capture_output=True)
-    return tag.strip() or "0.0.0"
+    tag = run(
+        [
+            "git",
+            "for-each-ref",
+            "--sort=-v:refname",
+            "--count=1",
+            "--format=%(refname:short)",
+            "refs/tags",
+        ],
+        capture_output=True,
+    )
+    return tag or "0.0.0"
 
 
 def commit_changes(message):
     """Commit all changes to git with the given message."""
     try:
-        run("git add -A")
-        run(f'git commit -m "{message}"', silent=True)
+        run(["git", "add", "-A"])
+        run(["git", "commit", "-m", message], silent=True)
     except subprocess.CalledProcessError:
         return False
 
@@ -1,16 +1,24 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from .distribution import default_chart_location, default_values_location
-from .git import get_submodules
+from .git import (
+    get_current_tag,
+    get_git_dir,
+    get_submodules,
+    max_fetch_workers,
+)
 from .semver import *
 from .utils import *
 
 
-def get_chart_version(chart_path, with_base_version=False):
+def get_chart_version(chart_path, with_base_version=False, with_name=False):
     if not os.path.exists(chart_path):
-        return None
+        return (None, None) if with_name else None
     chart = load_yaml(chart_path)
     version = chart.get("version")
+    if with_name:
+        return version, chart.get("name")
     return (
         version
         if not with_base_version
@@ -21,6 +29,50 @@ def get_chart_version(chart_path, with_base_version=False):
     )
 
 
+class ChartVersionCache:
+    """
+    On-disk cache of submodule chart versions and names, kept in the superproject's
+    git directory. Entries are keyed on the submodule's HEAD commit and the chart
+    file's stat, the latter only to catch uncommitted edits of the chart.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_git_dir("."), "relsync-chart-cache.json")
+        self.changed = False
+        try:
+            with open(self.path, "rb") as f:
+                self.entries = load_json_string(f.read())
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, chart_path, head):
+        """Return (version, name) of the chart like get_chart_version(..., with_name=True)."""
+        try:
+            stat = os.stat(chart_path)
+        except OSError:
+            return None, None
+        key = [head, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size]
+        entry = self.entries.get(chart_path)
+        if entry and entry["key"] == key:
+            return entry["version"], entry["name"]
+
+        version, name = get_chart_version(chart_path, with_name=True)
+        self.entries[chart_path] = {"key": key, "version": version, "name": name}
+        self.changed = True
+        return version, name
+
+    def save(self):
+        if not self.changed:
+            return
+        try:
+            with open(self.path, "w") as f:
+                dump_json(self.entries, f)
+        except OSError:
+            # not in a git checkout, the cache is only an optimization
+            return
+        self.changed = False
+
+
 def get_current_status_from_parent_chart(chart_path_overrides=None):
     """
     Return current state using the versions recorded in the parent chart dependencies
@@ -33,27 +85,37 @@ def get_current_status_from_parent_chart(chart_path_overrides=None):
     submodule_chart_path_overrides = chart_path_overrides.get("submodule_charts", {})
     parent_chart_path = chart_path_overrides.get("repo_chart")
 
-    # Compute bumps from current versions in parent chart dependencies
-    subchart_bumps = compute_subchart_bumps_from_parent(
-        parent_chart_path, submodule_chart_path_overrides
-    )
-
+    # Parse every chart once and share the results with the bump computation
+    sub_charts = {
+        name: load_yaml(os.path.join(path, submodule_chart_path_overrides.get(name)))
+        for name, path in submodules.items()
+    }
+    if os.path.isfile(parent_chart_path):
+        parent_chart = load_yaml(parent_chart_path)
+        # Compute bumps from current versions in parent chart dependencies
+        subchart_bumps = compute_subchart_bumps_from_parent(parent_chart, sub_charts)
+        parent_current = parent_chart.get("version")
+    else:
+        print(f"Parent chart not found: {parent_chart_path}", file=sys.stderr)
+        subchart_bumps = {}
+        parent_current = None
+
+    # one git process per submodule, they only wait on git so run them concurrently
+    workers = max(1, min(max_fetch_workers, len(submodules)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        current_tags = dict(
+            zip(submodules, ex.map(get_current_tag, submodules.values()))
+        )
     updates = {}
     for name, path in submodules.items():
-        chart_rel_path = submodule_chart_path_overrides.get(name)
-        sub_chart_path = os.path.join(path, chart_rel_path)
-        chart_data = load_yaml(sub_chart_path)
+        chart_data = sub_charts[name]
         chart_name = chart_data.get("name") or name
         current_version = chart_data.get("version")
 
         updates[name] = {
             "path": path,
             "chart_name": chart_name,
-            "current_tag": run(
-                "git describe --tags --exact-match 2>/dev/null || echo 'none'",
-                cwd=path,
-                capture_output=True,
-            ),
+            "current_tag": current_tags[name],
             "latest_tag": None,
             "suggested_tag": None,
             "recent_tags": [],
@@ -62,17 +124,12 @@ def get_current_status_from_parent_chart(chart_path_overrides=None):
             "chart_bump": subchart_bumps.get(name),
         }
 
-    parent_current = get_chart_version(parent_chart_path)
     # Decide parent bump from subchart bumps
-    max_bump_level = max(
-        (bump_priority[b] for b in subchart_bumps.values() if b is not None),
-        default=0,
+    bump = max(
+        (b for b in subchart_bumps.values() if b is not None),
+        key=bump_priority.get,
+        default=bump_by_priority[0],
     )
-    bump = None
-    for k, v in bump_priority.items():
-        if v == max_bump_level:
-            bump = k
-            break
 
     repo_bump = "minor" if bump and bump_priority[bump] > 2 else "patch"
     parent_info = {
@@ -86,33 +143,21 @@ def get_current_status_from_parent_chart(chart_path_overrides=None):
     return updates, parent_info
 
 
-def compute_subchart_bumps_from_parent(
-    parent_chart_path, submodule_chart_path_overrides=None
-):
+def compute_subchart_bumps_from_parent(parent_chart, sub_charts):
     """
     Returns a dict of submodule_name -> bump type based on parent chart dependencies.
     Only uses the versions in the parent chart, not the suggested tags.
+    Takes the parsed parent chart and a dict of submodule_name -> parsed chart.
     """
-    if submodule_chart_path_overrides is None:
-        submodule_chart_path_overrides = {}
-
-    if not os.path.isfile(parent_chart_path):
-        print(f"Parent chart not found: {parent_chart_path}", file=sys.stderr)
-        return {}
-
-    parent_chart = load_yaml(parent_chart_path)
     submodule_bumps = {}
-    submodules = get_submodules()
 
     # Map current versions from parent chart dependencies
     dep_versions = {
         dep["name"]: dep["version"] for dep in parent_chart.get("dependencies", [])
     }
 
-    for name, path in submodules.items():
-        chart_rel_path = submodule_chart_path_overrides.get(name)
-        sub_chart_path = os.path.join(path, chart_rel_path)
-        current_sub_version = get_chart_version(sub_chart_path)
+    for name, chart in sub_charts.items():
+        current_sub_version = chart.get("version")
         parent_dep_version = dep_versions.get(name)
 
         if parent_dep_version and current_sub_version:
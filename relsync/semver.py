@@ -1,8 +1,10 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Union, Tuple
 import re
 
 bump_priority = {"release": 0, "patch": 1, "minor": 2, "major": 3}
+bump_by_priority = {v: k for k, v in bump_priority.items()}
 
 semver_regex = re.compile(
     r"^(?P<prefix>v?)"
@@ -22,53 +24,58 @@ class VersionGroup(Enum):
     BUILDMETADATA = "buildmetadata"
 
 
+def _is_numeric_identifier(part: str) -> bool:
+    # same rule as the regex: "0" or a decimal number without leading zeros
+    return part == "0" or (part[:1] in "123456789" and part.isdecimal())
+
+
 # Return type can be int, str, or tuple[int, int, int]
+@lru_cache(maxsize=4096)
 def parse_version(
     version: str, group: Optional[VersionGroup] = None
 ) -> Optional[Union[int, str, Tuple[int, int, int]]]:
     """Split SemVer into components. Optionally return only a specific group."""
+    if group is None:
+        # plain "X.Y.Z" / "vX.Y.Z" is by far the most common input, skip the regex for it
+        parts = version.removeprefix("v").split(".")
+        if len(parts) == 3 and all(_is_numeric_identifier(p) for p in parts):
+            return tuple(map(int, parts))
+
     match_obj = semver_regex.match(version)
     if not match_obj:
         raise ValueError(f"Invalid SemVer: {version}")
 
-    major = int(match_obj.group("major"))
-    minor = int(match_obj.group("minor"))
-    patch = int(match_obj.group("patch"))
-    prerelease = match_obj.group("prerelease")
-    buildmetadata = match_obj.group("buildmetadata")
-
-    match group:
-        case VersionGroup.MAJOR:
-            return major
-        case VersionGroup.MINOR:
-            return minor
-        case VersionGroup.PATCH:
-            return patch
-        case VersionGroup.PRERELEASE:
-            return prerelease
-        case VersionGroup.BUILDMETADATA:
-            return buildmetadata
-        case None:
-            return (major, minor, patch)
+    major, minor, patch = map(int, match_obj.group("major", "minor", "patch"))
+    prerelease, buildmetadata = match_obj.group("prerelease", "buildmetadata")
+
+    if group is None:
+        return (major, minor, patch)
+    return {
+        VersionGroup.MAJOR: major,
+        VersionGroup.MINOR: minor,
+        VersionGroup.PATCH: patch,
+        VersionGroup.PRERELEASE: prerelease,
+        VersionGroup.BUILDMETADATA: buildmetadata,
+    }.get(group)
 
 
 def get_version_string(version):
-    version_parts = parse_version(version)
-    return ".".join(str(part) for part in version_parts)
+    return "{}.{}.{}".format(*parse_version(version))
 
 
 def version_bump(old, new):
     """Return bump type: 'patch', 'minor', 'major', or None."""
-    old_major, old_minor, old_patch = parse_version(old)
-    new_major, new_minor, new_patch = parse_version(new)
-
-    if new_major > old_major:
-        return "major"
-    elif new_minor > old_minor:
-        return "minor"
-    elif new_patch > old_patch:
-        return "patch"
-    return None
+    # first component that grew, checked from major down like the old if/elif chain
+    return next(
+        (
+            bump
+            for bump, old_part, new_part in zip(
+                ("major", "minor", "patch"), parse_version(old), parse_version(new)
+            )
+            if new_part > old_part
+        ),
+        None,
+    )
 
 
 def bump_version(version, bump):
@@ -1,12 +1,22 @@
+from collections import ChainMap
+
 from .utils import parse_json_arg, parse_json_file, prompt, run
 
 
 def parse_tag_overrides(tag_overrides_file_path, tag_overrides_arg):
-    return parse_json_file(tag_overrides_file_path) | parse_json_arg(tag_overrides_arg)
+    # CLI overrides take precedence over the file, without copying either dict
+    return ChainMap(
+        parse_json_arg(tag_overrides_arg), parse_json_file(tag_overrides_file_path)
+    )
 
 
 def apply_submodule_updates(updates, yes=False, quiet=False):
+    """Check out the selected tag of each submodule.
 
+    Returns a dict of submodule name -> changed update info fields.
+    """
+    delta = {}
+    paths = []
     for submodule, info in updates.items():
         if not quiet:
             print(f"\nProcessing submodule: {submodule}")
@@ -35,24 +45,33 @@ def apply_submodule_updates(updates, yes=False, quiet=False):
             )
 
         if ans.lower() == "s":
-            if quiet:
-                run(f"git checkout -q {suggested_tag}", cwd=path)
-            else:
-                run(f"git checkout {suggested_tag}", cwd=path)
+            tag = suggested_tag
         elif ans.lower() == "l":
-            if quiet:
-                run(f"git checkout -q {latest_tag}", cwd=path)
-            else:
-                run(f"git checkout {latest_tag}", cwd=path)
+            tag = latest_tag
         elif ans.isdigit() and 1 <= int(ans) <= len(tags):
-            if quiet:
-                run(f"git checkout -q {tags[int(ans)-1]}", cwd=path)
-            else:
-                run(f"git checkout {tags[int(ans)-1]}", cwd=path)
-
+            tag = tags[int(ans) - 1]
         else:
+            tag = None
             print(
                 f'Skipping submodule "{submodule}" because of unrecognized option "{ans}"'
             )
 
-        run(f"git add {path}")
+        if tag is not None:
+            if quiet:
+                run(["git", "checkout", "-q", tag], cwd=path)
+            else:
+                run(["git", "checkout", tag], cwd=path)
+            changed = {"current_tag": tag}
+            if tag == suggested_tag:
+                changed["current_tag_chart_version"] = info[
+                    "suggested_tag_chart_version"
+                ]
+            delta[submodule] = changed
+
+        paths.append(path)
+
+    # stage all submodules with a single git add
+    if paths:
+        run(["git", "add", "--", *paths])
+
+    return delta
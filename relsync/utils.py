@@ -1,38 +1,55 @@
+import copy
 import json
 import os
+import re
+import shlex
 import subprocess
 import sys
+from functools import lru_cache
 
 try:
     import yaml
 
-    def load_yaml(path):
+    try:
+        from yaml import CSafeDumper as _Dumper
+        from yaml import CSafeLoader as _Loader
+    except ImportError:
+        from yaml import SafeDumper as _Dumper
+        from yaml import SafeLoader as _Loader
+
+    def _load_yaml_file(path):
         try:
             with open(path) as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_Loader)
         except:
             return {}
 
-    def dump_yaml(data, path):
+    def _dump_yaml_file(data, path):
         with open(path, "w") as f:
-            yaml.safe_dump(data, f, sort_keys=False)
+            yaml.dump(data, f, Dumper=_Dumper, sort_keys=False)
 
     def load_yaml_string(yaml_str):
         try:
-            return yaml.safe_load(yaml_str) or {}
+            return yaml.load(yaml_str, Loader=_Loader) or {}
+        except:
+            return {}
+
+    def load_yaml_bytes(yaml_bytes):
+        try:
+            # the loader parses the raw bytes directly, no decode needed
+            return yaml.load(yaml_bytes, Loader=_Loader) or {}
         except:
             return {}
 
 except ImportError:
+    yq_version_regex = re.compile(r"version\s+(\d+)\.(\d+)\.(\d+)")
 
     def yq_available(min_major=4):
         try:
             out = subprocess.run(
                 ["yq", "--version"], capture_output=True, text=True, check=True
             )
-            import re
-
-            match = re.search(r"version\s+(\d+)\.(\d+)\.(\d+)", out.stdout)
+            match = yq_version_regex.search(out.stdout)
             if not match:
                 return False
             major, minor, patch = map(int, match.groups())
@@ -46,15 +63,26 @@ except ImportError:
         )
         sys.exit(1)
 
-    print("PyYAML not installed, using yq for YAML parsing")
+    print(
+        "PyYAML not installed, using yq for YAML parsing. Every chart read and write"
+        " starts a yq process, install PyYAML for much faster runs",
+        file=sys.stderr,
+    )
 
-    def load_yaml(path):
-        out = subprocess.run(
-            ["yq", "-o=json", ".", path], capture_output=True, text=True, check=True
-        )
-        return json.loads(out.stdout)
+    def _load_yaml_file(path):
+        # parse straight from the pipe instead of buffering the output first
+        with subprocess.Popen(
+            ["yq", "-o=json", ".", path], stdout=subprocess.PIPE
+        ) as proc:
+            try:
+                data = json.load(proc.stdout)
+            except json.JSONDecodeError:
+                data = None
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        return data
 
-    def dump_yaml(data, path):
+    def _dump_yaml_file(data, path):
         json_str = json.dumps(data)
         subprocess.run(
             ["yq", "-P", "-o=yaml", ".", "-i", path],
@@ -78,22 +106,102 @@ except ImportError:
         except:
             return {}
 
+    def load_yaml_bytes(yaml_bytes):
+        """Load YAML from bytes using yq fallback."""
+        proc = subprocess.run(
+            ["yq", "-o=json", "."],
+            input=yaml_bytes,
+            capture_output=True,
+            check=True,
+        )
+        try:
+            return json.loads(proc.stdout) or {}
+        except:
+            return {}
+
+
+@lru_cache(maxsize=256)
+def _load_yaml_cached(abs_path, mtime_ns):
+    return _load_yaml_file(abs_path)
+
+
+def load_yaml(path):
+    """Load a YAML file, reusing the parse while its mtime is unchanged."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return _load_yaml_file(path)
+    # callers mutate the chart dicts, so never hand out the cached object
+    return copy.deepcopy(_load_yaml_cached(os.path.abspath(path), mtime_ns))
+
+
+def dump_yaml(data, path):
+    _dump_yaml_file(data, path)
+    _load_yaml_cached.cache_clear()
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(data, f):
+    """Write data as indented JSON to a text stream without building a str copy."""
+    if orjson is not None and hasattr(f, "buffer"):
+        out = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        # orjson writes non-ASCII as raw UTF-8 where json escapes it, and raw bytes
+        # would bypass the stream's encoding, so only ASCII output takes this path
+        if out.isascii():
+            # orjson cannot stream, but its bytes can go straight to the binary buffer
+            f.flush()
+            f.buffer.write(out)
+            f.buffer.flush()
+            return
+    json.dump(data, f, indent=2)
+
+
+def load_json_string(raw):
+    """Parse a JSON str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def run(cmd, cwd=None, capture_output=False, silent=False, binary=False):
+    """Run a command without a shell. Strings are split into argv like a shell would.
+
+    With capture_output, binary=True returns the raw stdout bytes instead of text.
+    """
+    if isinstance(cmd, str):
+        cmd = shlex.split(cmd)
+    if capture_output:
+        # stderr is discarded, so the single stdout pipe can be read directly
+        # instead of going through communicate()
+        with subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            text=not binary,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ) as proc:
+            out = proc.stdout.read()
+        return out if binary else out.strip()
 
-def run(cmd, cwd=None, capture_output=False, silent=False):
-    """Run a shell command."""
     result = subprocess.run(
         cmd,
         cwd=cwd,
-        shell=True,
-        capture_output=capture_output,
-        text=True,
         stdout=subprocess.DEVNULL if silent else None,
         stderr=subprocess.DEVNULL if silent else None,
     )
-    if capture_output:
-        return result.stdout.strip()
-    else:
-        result.check_returncode()
+    result.check_returncode()
+
+
+def cached(cache, key, func, *args):
+    """Return func(*args), memoized in the cache dict under key."""
+    if key not in cache:
+        cache[key] = func(*args)
+    return cache[key]
 
 
 def prompt(msg, default=None):
@@ -109,9 +217,9 @@ def safe(v):
 
 def parse_json_file(tag_overrides_file_path):
     if tag_overrides_file_path and os.path.isfile(tag_overrides_file_path):
-        with open(tag_overrides_file_path) as f:
+        with open(tag_overrides_file_path, "rb") as f:
             try:
-                overrides_map = json.load(f)
+                overrides_map = load_json_string(f.read())
             except:
                 return {}
         return overrides_map
@@ -119,8 +227,11 @@ def parse_json_file(tag_overrides_file_path):
 
 
 def parse_json_arg(tag_overrides_arg):
+    if not tag_overrides_arg:
+        # unset options are None or "", skip raising and catching a decode error
+        return {}
     try:
-        overrides_map = json.loads(tag_overrides_arg)
+        overrides_map = load_json_string(tag_overrides_arg)
     except:
         return {}
 
@@ -131,16 +242,16 @@ def save_state(updates, parent_info, path):
     """Save updates and parent info to JSON."""
     state = {"updates": updates, "parent_info": parent_info}
     with open(path, "w") as f:
-        json.dump(state, f, indent=2)
+        dump_json(state, f)
 
 
 def load_state(path):
     """Load updates and parent info from JSON."""
     if not os.path.isfile(path):
         return None, None
-    with open(path) as f:
+    with open(path, "rb") as f:
         try:
-            state = json.load(f)
+            state = load_json_string(f.read())
             return state.get("updates"), state.get("parent_info")
         except Exception:
             return None, None